@@ -61,7 +61,7 @@ def save(w, file_name=None, L2norm_fractional_tolerance=1e-10, log_frame=None, c
             w, log_frame = w.to_corotating_frame(
                 tolerance=1e-10, z_alignment_region=z_alignment_region, truncate_log_frame=True
             )
-            log_frame = log_frame[:, 1:]
+            log_frame = np.ascontiguousarray(log_frame[:, 1:])
         if w.frameType != scri.Corotating:
             raise ValueError(
                 "Frame type of input waveform must be 'Corotating' or 'Inertial'; " f"it is {w.frame_type_string}"
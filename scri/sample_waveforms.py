@@ -491,12 +491,14 @@ def fake_precessing_waveform(
     if precession_nutation_angle is None:
         precession_nutation_angle = precession_opening_angle / 10.0
     R_orbital = np.exp(phi * quaternion.z / 2)
-    R_opening = np.exp(
-        transition_to_constant(precession_opening_angle + precession_opening_angle_dot * t, t, t0, t1)
-        * quaternion.x
-        / 2
-    )
-    R_precession = np.exp(transition_to_constant(phi / precession_relative_rate, t, t0, t1) * quaternion.z / 2)
+    opening_angle = precession_opening_angle + precession_opening_angle_dot * t
+    precession_angle = phi / precession_relative_rate
+    # Both angles share one evaluation of the transition function
+    opening_angle, precession_angle = transition_to_constant(
+        np.stack([opening_angle, precession_angle], axis=-1), t, t0, t1
+    ).T
+    R_opening = np.exp(opening_angle * quaternion.x / 2)
+    R_precession = np.exp(precession_angle * quaternion.z / 2)
     R_nutation = np.exp(precession_nutation_angle * transition * quaternion.x / 2)
     frame = (
         R_orbital * R_nutation * R_orbital.conjugate() * R_precession * R_opening * R_precession.conjugate() * R_orbital
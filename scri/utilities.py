@@ -2,39 +2,257 @@
 # See LICENSE file for details: <https://github.com/moble/scri/blob/master/LICENSE>
 
 import functools
+import sys
 import numpy as np
+import numba
 from . import jit
 
-maxexp = np.finfo(float).maxexp * np.log(2) * 0.99
+# The transition kernels rely on IEEE infinities (1/(1+exp(g)) is exactly 0 when exp(g) overflows),
+# so they cannot use "nnan" or "ninf".  Nor can they use "reassoc", which would merge the two-step
+# argument reduction in `_exp`; that function is inlined, so it is compiled with these flags.
+_fastmath = {"nsz", "arcp", "contract", "afn"}
 
+# Rounding can put tau = (x-x0)/(x1-x0) on the boundary of (0, 1) even for x strictly inside (x0, x1).
+# Clamping keeps 1/tau**2 and 1/(1-tau)**2 finite, so the vanishing exponential factors there give
+# exactly 0 (or 1) rather than NaN.
+_tau_min = 1e-150
+_tau_max = 1.0 - 2.0 ** -53
 
-@jit
-def _transition_function(x, x0, x1, y0, y1):
+_ln2_hi = 6.93147180369123816490e-01  # Cody-Waite split of log(2); `n * _ln2_hi` is exact for |n| < 2**20
+_ln2_lo = 1.90821492927058770002e-10
+_exp_taylor = tuple(1.0 / float(np.prod(np.arange(1, k + 1))) for k in range(13))
+_powers_of_two = np.ldexp(1.0, np.arange(-1074, 1024))  # 2**n at index n + 1074
+
+
+@jit(inline="always", fastmath=_fastmath)
+def _exp(x):
+    """Evaluate exp(x) to within a couple of ulps without calling libm
+
+    This writes x = n*log(2) + t with |t| <= log(2)/2, evaluates a degree-12 Taylor polynomial in
+    t, and scales by a tabulated 2**n.  Unlike `np.exp`, this can be inlined and vectorized without
+    Intel's SVML library (`icc_rt`).  Note that "reassoc" must not be among the fastmath flags of
+    any function this is inlined into, or the two-step reduction would be merged.
+
+    """
+    x = min(max(x, -746.0), 710.0)
+    n = np.floor(x * (1 / np.log(2)) + 0.5)
+    t = (x - n * _ln2_hi) - n * _ln2_lo
+    c = _exp_taylor
+    p = c[12]
+    p = p * t + c[11]
+    p = p * t + c[10]
+    p = p * t + c[9]
+    p = p * t + c[8]
+    p = p * t + c[7]
+    p = p * t + c[6]
+    p = p * t + c[5]
+    p = p * t + c[4]
+    p = p * t + c[3]
+    p = p * t + c[2]
+    p = p * t + c[1]
+    p = p * t + c[0]
+    k = int(n)
+    if k < -1022:  # Keep the product out of the subnormals until the last step
+        return (p * 2.0 ** -52) * _powers_of_two[k + 52 + 1074]
+    if k > 1023:  # 2**1024 overflows, even when exp(x) itself does not
+        return (p * 2.0) * _powers_of_two[k - 1 + 1074]
+    return p * _powers_of_two[k + 1074]
+
+
+def _transition_indices(x, x0, x1):
+    """Return (i0, i1) such that x[:i0] <= x0 < x[i0:i1] < x1 <= x[i1:] for monotonic `x`"""
+    i0 = int(np.searchsorted(x, x0, side="right"))
+    i1 = max(i0, int(np.searchsorted(x, x1, side="left")))
+    return i0, i1
+
+
+@jit(inline="always", fastmath=_fastmath, error_model="numpy")
+def _transition_point(x, x0, inv_width, y0, ydiff):
+    tau = min(max((x - x0) * inv_width, _tau_min), _tau_max)
+    exponent = 1.0 / tau - 1.0 / (1.0 - tau)
+    return y0 + ydiff / (1.0 + _exp(exponent))
+
+
+@jit(inline="always", fastmath=_fastmath, error_model="numpy")
+def _transition_derivative_point(x, x0, inv_width, ydiff):
+    tau = min(max((x - x0) * inv_width, _tau_min), _tau_max)
+    inv_tau = 1.0 / tau
+    inv_1m_tau = 1.0 / (1.0 - tau)
+    exponential = _exp(inv_tau - inv_1m_tau)
+    # exp/(1+exp)**2 == sigma*(1-sigma), written so that it is 0 rather than inf/inf at the ends
+    return (
+        ydiff
+        * inv_width
+        * (inv_tau * inv_tau + inv_1m_tau * inv_1m_tau)
+        / ((1.0 + exponential) * (1.0 + 1.0 / exponential))
+    )
+
+
+@jit(fastmath=_fastmath, error_model="numpy", boundscheck=False)
+def _transition_interior_serial(x, x0, x1, y0, y1):
+    """Evaluate the transition function at points `x` that are all strictly inside (x0, x1)"""
+    transition = np.empty_like(x)
+    inv_width = 1.0 / (x1 - x0)
+    for i in range(x.size):
+        transition[i] = _transition_point(x[i], x0, inv_width, y0, y1 - y0)
+    return transition
+
+
+@jit(parallel=True, fastmath=_fastmath, error_model="numpy", boundscheck=False)
+def _transition_interior_parallel(x, x0, x1, y0, y1):
+    transition = np.empty_like(x)
+    inv_width = 1.0 / (x1 - x0)
+    for i in numba.prange(x.size):
+        transition[i] = _transition_point(x[i], x0, inv_width, y0, y1 - y0)
+    return transition
+
+
+@jit(fastmath=_fastmath, error_model="numpy", boundscheck=False)
+def _transition_derivative_interior_serial(x, x0, x1, y0, y1):
+    """Evaluate the derivative of the transition function at points strictly inside (x0, x1)"""
+    transition_prime = np.empty_like(x)
+    inv_width = 1.0 / (x1 - x0)
+    for i in range(x.size):
+        transition_prime[i] = _transition_derivative_point(x[i], x0, inv_width, y1 - y0)
+    return transition_prime
+
+
+@jit(parallel=True, fastmath=_fastmath, error_model="numpy", boundscheck=False)
+def _transition_derivative_interior_parallel(x, x0, x1, y0, y1):
+    transition_prime = np.empty_like(x)
+    inv_width = 1.0 / (x1 - x0)
+    for i in numba.prange(x.size):
+        transition_prime[i] = _transition_derivative_point(x[i], x0, inv_width, y1 - y0)
+    return transition_prime
+
+
+_transition_parallel_threshold = 10_000  # Below this many points, threads cost more than they save
+
+
+def _transition_interior(x, x0, x1, y0, y1):
+    if x.size < _transition_parallel_threshold or numba.get_num_threads() == 1:
+        return _transition_interior_serial(x, x0, x1, y0, y1)
+    return _transition_interior_parallel(x, x0, x1, y0, y1)
+
+
+def _transition_derivative_interior(x, x0, x1, y0, y1):
+    if x.size < _transition_parallel_threshold or numba.get_num_threads() == 1:
+        return _transition_derivative_interior_serial(x, x0, x1, y0, y1)
+    return _transition_derivative_interior_parallel(x, x0, x1, y0, y1)
+
+
+@jit(inline="always", fastmath=_fastmath, error_model="numpy")
+def _transition_derivative_from_sigma(x, x0, inv_width, ydiff, sigma):
+    tau = min(max((x - x0) * inv_width, _tau_min), _tau_max)
+    inv_tau = 1.0 / tau
+    inv_1m_tau = 1.0 / (1.0 - tau)
+    return ydiff * inv_width * sigma * (1.0 - sigma) * (inv_tau * inv_tau + inv_1m_tau * inv_1m_tau)
+
+
+@jit(fastmath=_fastmath, error_model="numpy", boundscheck=False)
+def _transition_derivative_times_f(x, x0, x1, y0, y1, transition, f, f_transition, f_transition_dot):
+    """Store f times the transition function and f times its derivative, for x inside (x0, x1)
+
+    The derivative is recovered from the already evaluated `transition` values, without another
+    exponential, using the fact that d/dx 1/(1+exp(g)) is sigma*(1-sigma)*(-dg/dx) with
+    sigma = 1/(1+exp(g)).  The arrays `f`, `f_transition`, and `f_transition_dot` are C-contiguous
+    and 2-d, with one row per element of `x`.
+
+    """
+    ydiff = y1 - y0
+    inv_ydiff = 1.0 / ydiff
+    inv_width = 1.0 / (x1 - x0)
+    if f.shape[1] == 1:  # Keep the trivial inner loop from blocking vectorization along `x`
+        f = f.reshape(f.size)
+        f_transition = f_transition.reshape(f_transition.size)
+        f_transition_dot = f_transition_dot.reshape(f_transition_dot.size)
+        for i in range(x.size):
+            sigma = (transition[i] - y0) * inv_ydiff
+            f_transition[i] = f[i] * transition[i]
+            f_transition_dot[i] = f[i] * _transition_derivative_from_sigma(x[i], x0, inv_width, ydiff, sigma)
+    else:
+        for i in range(x.size):
+            sigma = (transition[i] - y0) * inv_ydiff
+            transition_dot = _transition_derivative_from_sigma(x[i], x0, inv_width, ydiff, sigma)
+            for j in range(f.shape[1]):
+                f_transition[i, j] = f[i, j] * transition[i]
+                f_transition_dot[i, j] = f[i, j] * transition_dot
+
+
+@jit(fastmath=_fastmath, error_model="numpy", boundscheck=False)
+def _hard_transition_interior(x, x0, x1, y0, y1):
+    transition = np.empty_like(x)
+    slope = (y1 - y0) / (x1 - x0)
+    for i in range(x.size):
+        transition[i] = y0 + slope * (x[i] - x0)
+    return transition
+
+
+@jit(fastmath=_fastmath, error_model="numpy", boundscheck=False)
+def _hard_transition_derivative_interior(x, x0, x1, y0, y1):
+    transition_prime = np.empty_like(x)
+    transition_prime[:] = (y1 - y0) / (x1 - x0)
+    return transition_prime
+
+
+@jit(fastmath=_fastmath, error_model="numpy", boundscheck=False)
+def _rational_transition_interior(x, x0, x1, y0, y1):
+    # Same form as the smooth transition, 1 / (1 + f(1-tau)/f(tau)), but with f(tau) = tau**4
+    # in place of exp(-1/tau)
     transition = np.empty_like(x)
     ydiff = y1 - y0
-    i = 0
-    while x[i] <= x0:
-        i += 1
-    i0 = i
+    inv_width = 1.0 / (x1 - x0)
+    for i in range(x.size):
+        tau = (x[i] - x0) * inv_width
+        a = tau * tau * tau * tau
+        b = (1.0 - tau) * (1.0 - tau) * (1.0 - tau) * (1.0 - tau)
+        transition[i] = y0 + ydiff * a / (a + b)
+    return transition
+
+
+@jit(fastmath=_fastmath, error_model="numpy", boundscheck=False)
+def _rational_transition_derivative_interior(x, x0, x1, y0, y1):
+    transition_prime = np.empty_like(x)
+    scale = 4.0 * (y1 - y0) / (x1 - x0)
+    inv_width = 1.0 / (x1 - x0)
+    for i in range(x.size):
+        tau = (x[i] - x0) * inv_width
+        a = tau * tau * tau * tau
+        b = (1.0 - tau) * (1.0 - tau) * (1.0 - tau) * (1.0 - tau)
+        transition_prime[i] = scale * tau ** 3 * (1.0 - tau) ** 3 / ((a + b) * (a + b))
+    return transition_prime
+
+
+_transition_kinds = {
+    "smooth": (_transition_interior, _transition_derivative_interior),
+    "hard": (_hard_transition_interior, _hard_transition_derivative_interior),
+    "rational": (_rational_transition_interior, _rational_transition_derivative_interior),
+}
+
+
+def _transition_kernels(kind):
+    try:
+        return _transition_kinds[kind]
+    except KeyError:
+        raise ValueError(f"Unknown transition kind {kind!r}; must be one of {list(_transition_kinds)}") from None
+
+
+def _transition_and_indices(x, x0, x1, y0, y1, kind="smooth"):
+    interior = _transition_kernels(kind)[0]
+    i0, i1 = _transition_indices(x, x0, x1)
+    transition = np.empty_like(x)
     transition[:i0] = y0
-    while x[i] < x1:
-        tau = (x[i] - x0) / (x1 - x0)
-        exponent = 1.0 / tau - 1.0 / (1.0 - tau)
-        if exponent >= maxexp:
-            transition[i] = y0
-        else:
-            transition[i] = y0 + ydiff / (1.0 + np.exp(exponent))
-        i += 1
-    i1 = i
+    transition[i0:i1] = interior(x[i0:i1], x0, x1, y0, y1)
     transition[i1:] = y1
     return transition, i0, i1
 
 
-def transition_function(x, x0, x1, y0=0.0, y1=1.0, return_indices=False):
+def transition_function(x, x0, x1, y0=0.0, y1=1.0, return_indices=False, kind="smooth"):
     """Return a smooth function that is constant outside (x0, x1).
 
-    This uses the standard smooth (C^infinity) function with derivatives of compact support to
-    transition between the two values, being constant outside of the transition region (x0, x1).
+    By default, this uses the standard smooth (C^infinity) function with derivatives of compact
+    support to transition between the two values, being constant outside of the transition region
+    (x0, x1).  Cheaper approximations that avoid evaluating `exp` can be selected with `kind`.
 
     Parameters
     ==========
@@ -51,15 +269,20 @@ def transition_function(x, x0, x1, y0=0.0, y1=1.0, return_indices=False):
     return_indices: bool [defaults to False]
         If True, return the array and the indices (i0, i1) at which the transition occurs, such that
         t[:i0]==y0 and t[i1:]==y1.
+    kind: {"smooth", "hard", "rational"} [defaults to "smooth"]
+        Shape of the transition, in terms of tau = (x-x0)/(x1-x0).  "smooth" is the C^infinity
+        function 1/(1+exp(1/tau-1/(1-tau))); "rational" replaces exp(-1/tau) in that construction
+        with tau**4, giving tau**4/(tau**4+(1-tau)**4), which is only C^3 at x0 and x1; "hard" is
+        the linear ramp tau, which is only continuous.
 
     """
+    transition, i0, i1 = _transition_and_indices(x, x0, x1, y0, y1, kind)
     if return_indices:
-        return _transition_function(x, x0, x1, y0, y1)
-    return _transition_function(x, x0, x1, y0, y1)[0]
+        return transition, i0, i1
+    return transition
 
 
-@jit
-def transition_function_derivative(x, x0, x1, y0=0.0, y1=1.0):
+def transition_function_derivative(x, x0, x1, y0=0.0, y1=1.0, kind="smooth"):
     """Return derivative of the transition function
 
     This function simply returns the derivative of `transition_function` with respect to the `x`
@@ -77,33 +300,18 @@ def transition_function_derivative(x, x0, x1, y0=0.0, y1=1.0):
         Value of the output before `x0`.
     y1: float [defaults to 1.0]
         Value of the output after `x1`.
+    kind: {"smooth", "hard", "rational"} [defaults to "smooth"]
+        Shape of the transition; see `transition_function`.
 
     """
+    derivative_interior = _transition_kernels(kind)[1]
+    i0, i1 = _transition_indices(x, x0, x1)
     transition_prime = np.zeros_like(x)
-    ydiff = y1 - y0
-    i = 0
-    while x[i] <= x0:
-        i += 1
-    while x[i] < x1:
-        tau = (x[i] - x0) / (x1 - x0)
-        exponent = 1.0 / tau - 1.0 / (1.0 - tau)
-        if exponent >= maxexp:
-            transition_prime[i] = 0.0
-        else:
-            exponential = np.exp(1.0 / tau - 1.0 / (1.0 - tau))
-            transition_prime[i] = (
-                -ydiff
-                * exponential
-                * (-1.0 / tau ** 2 - 1.0 / (1.0 - tau) ** 2)
-                * (1 / (x1 - x0))
-                / (1.0 + exponential) ** 2
-            )
-        i += 1
+    transition_prime[i0:i1] = derivative_interior(x[i0:i1], x0, x1, y0, y1)
     return transition_prime
 
 
-@jit
-def bump_function(x, x0, x1, x2, x3, y0=0.0, y12=1.0, y3=0.0):
+def bump_function(x, x0, x1, x2, x3, y0=0.0, y12=1.0, y3=0.0, kind="smooth"):
     """Return a smooth bump function that is constant outside (x0, x3) and inside (x1, x2).
 
     This uses the standard C^infinity function with derivatives of compact support to transition
@@ -126,36 +334,20 @@ def bump_function(x, x0, x1, x2, x3, y0=0.0, y12=1.0, y3=0.0):
         Value of the output after `x1` but before `x2`.
     y3: float [defaults to 0.0]
         Value of the output after `x3`.
+    kind: {"smooth", "hard", "rational"} [defaults to "smooth"]
+        Shape of the two transitions; see `transition_function`.
 
     """
+    interior = _transition_kernels(kind)[0]
+    i0, i1 = _transition_indices(x, x0, x1)
+    i2, i3 = _transition_indices(x, x2, x3)
+    i2, i3 = max(i1, i2), max(i1, i3)
     bump = np.empty_like(x)
-    ydiff01 = y12 - y0
-    ydiff23 = y3 - y12
-    i = 0
-    while x[i] <= x0:
-        i += 1
-    bump[:i] = y0
-    while x[i] < x1:
-        tau = (x[i] - x0) / (x1 - x0)
-        exponent = 1.0 / tau - 1.0 / (1.0 - tau)
-        if exponent >= maxexp:
-            bump[i] = y0
-        else:
-            bump[i] = y0 + ydiff01 / (1.0 + np.exp(exponent))
-        i += 1
-    i1 = i
-    while x[i] <= x2:
-        i += 1
-    bump[i1:i] = y12
-    while x[i] < x3:
-        tau = (x[i] - x2) / (x3 - x2)
-        exponent = 1.0 / tau - 1.0 / (1.0 - tau)
-        if exponent >= maxexp:
-            bump[i] = y12
-        else:
-            bump[i] = y12 + ydiff23 / (1.0 + np.exp(exponent))
-        i += 1
-    bump[i:] = y3
+    bump[:i0] = y0
+    bump[i0:i1] = interior(x[i0:i1], x0, x1, y0, y12)
+    bump[i1:i2] = y12
+    bump[i2:i3] = interior(x[i2:i3], x2, x3, y12, y3)
+    bump[i3:] = y3
     return bump
 
 
@@ -172,7 +364,9 @@ def transition_to_constant(f, t, t1, t2):
     Parameters
     ==========
     f: array_like
-        One-dimensional array corresponding to the following `t` parameter.
+        Array whose first axis corresponds to the following `t` parameter.  Any further axes (for
+        example, one per mode) are transitioned independently, but share a single evaluation of the
+        transition function, so passing them together is cheaper than transitioning each separately.
     t: array_like
         One-dimensional monotonic array of floats.
     t1: float
@@ -183,20 +377,186 @@ def transition_to_constant(f, t, t1, t2):
     """
     from quaternion import indefinite_integral
 
-    transition, i1, i2 = transition_function(t, t1, t2, y0=1.0, y1=0.0, return_indices=True)
-    transition_dot = transition_function_derivative(t, t1, t2, y0=1.0, y1=0.0)
-    f_transitioned = f * transition
-    f_transitioned[i1:i2] -= indefinite_integral(f[i1:i2] * transition_dot[i1:i2], t[i1:i2])
+    f = np.asarray(f)
+    transition, i1, i2 = _transition_and_indices(t, t1, t2, 1.0, 0.0)
+    f_transitioned = np.empty(f.shape, dtype=np.result_type(f, t))
+    f_transitioned[:i1] = f[:i1]
+    f_transition_dot = np.empty_like(f_transitioned[i1:i2])
+    rows = (i2 - i1, int(np.prod(f.shape[1:], dtype=int)))  # Extra axes of `f` are flattened into columns
+    _transition_derivative_times_f(
+        t[i1:i2],
+        t1,
+        t2,
+        1.0,
+        0.0,
+        transition[i1:i2],
+        np.ascontiguousarray(f[i1:i2]).reshape(rows),
+        f_transitioned[i1:i2].reshape(rows),
+        f_transition_dot.reshape(rows),
+    )
+    f_transitioned[i1:i2] -= indefinite_integral(f_transition_dot, t[i1:i2])
     f_transitioned[i2:] = f_transitioned[i2 - 1]
     return f_transitioned
 
 
+_xor_word_dtypes = (np.uint64, np.uint32, np.uint16, np.uint8)
+
+
+def _xor_word_dtype(c):
+    """Return the widest unsigned-integer dtype that evenly divides each time step of `c`
+
+    For a 1-d input, each 64-bit word is a time step, exactly as in `c.view(np.uint64)`, so this
+    is always uint64.  For higher-dimensional inputs, the XOR of two rows does not depend on the
+    word size, so rows that are not a whole number of 64-bit words fall back to narrower words.
+    Arrays that are not C-contiguous can only be viewed without copying if their items are already
+    64 bits wide, as with `c.view(np.uint64)`.
+
+    """
+    if not c.flags["C_CONTIGUOUS"]:
+        if c.itemsize != 8:
+            raise ValueError(
+                "This function only accepts arrays that are C-contiguous or have 8-byte items; "
+                "use `np.ascontiguousarray` first."
+            )
+        return np.uint64
+    row_bytes = c.shape[-1] * c.itemsize
+    if c.ndim == 1:
+        if row_bytes % 8 != 0:
+            raise ValueError(f"A 1-d input must be a whole number of 64-bit words, but has {row_bytes} bytes")
+        return np.uint64
+    for word in _xor_word_dtypes:
+        if row_bytes % np.dtype(word).itemsize == 0:
+            return word
+
+
+def _xor_rows(c):
+    """View a C-contiguous array as a 2-d array of unsigned words, with one row per time step
+
+    The words are the widest chosen by `_xor_word_dtype`; in particular, a 1-d input is treated as
+    a flat sequence of 64-bit words, with one word per row.
+
+    """
+    if c.ndim == 0 or c.size == 0:
+        return np.empty((0, 1), dtype=np.uint64)
+    word = _xor_word_dtype(c)
+    u = c if c.dtype == word else c.view(word)
+    if u.ndim == 1:
+        return u.reshape(u.size, 1)
+    return u.reshape(u.shape[0], -1)
+
+
+@jit
+def _xor_timeseries_strided(u):
+    # Arrays that are not C-contiguous, like `a[:, 1:]`, cannot be flattened into rows without a
+    # copy, so they are processed in place one time step at a time
+    for i in range(u.shape[0] - 1, 0, -1):
+        u[i] ^= u[i - 1]
+
+
+@jit
+def _xor_timeseries_reverse_strided(u):
+    for i in range(1, u.shape[0]):
+        u[i] ^= u[i - 1]
+
+
+_xor_tile = 2048  # Two rows of this many uint64 words fill 32 KiB, a typical L1 data cache; narrower words fit easily
+
+
+@jit
+def _xor_tile_backward(u, j0, j1):
+    for i in range(u.shape[0] - 1, 0, -1):
+        row = u[i, j0:j1]
+        previous_row = u[i - 1, j0:j1]
+        for j in range(row.size):
+            row[j] ^= previous_row[j]
+
+
+@jit
+def _xor_tile_forward(u, j0, j1):
+    for i in range(1, u.shape[0]):
+        row = u[i, j0:j1]
+        previous_row = u[i - 1, j0:j1]
+        for j in range(row.size):
+            row[j] ^= previous_row[j]
+
+
+@jit
+def _xor_timeseries(u):
+    if u.shape[1] == 1:  # Keep the trivial inner loop from blocking vectorization along time
+        v = u.reshape(u.size)
+        for i in range(v.size - 1, 0, -1):
+            v[i] ^= v[i - 1]
+    elif u.shape[1] <= _xor_tile:
+        for i in range(u.shape[0] - 1, 0, -1):
+            # Contiguous and independent across `j`, so LLVM emits packed XORs for whatever CPU this
+            # is compiled on: SSE/AVX on x86-64, or NEON (`veorq_u64`) on AArch64
+            for j in range(u.shape[1]):
+                u[i, j] ^= u[i - 1, j]
+    else:  # Rows too wide for L1 are done one tile of columns at a time, so each row is reused from cache
+        for j0 in range(0, u.shape[1], _xor_tile):
+            _xor_tile_backward(u, j0, min(j0 + _xor_tile, u.shape[1]))
+
+
 @jit
+def _xor_timeseries_reverse(u):
+    if u.shape[1] == 1:
+        v = u.reshape(u.size)
+        for i in range(1, v.size):
+            v[i] ^= v[i - 1]
+    elif u.shape[1] <= _xor_tile:
+        for i in range(1, u.shape[0]):
+            for j in range(u.shape[1]):
+                u[i, j] ^= u[i - 1, j]
+    else:
+        for j0 in range(0, u.shape[1], _xor_tile):
+            _xor_tile_forward(u, j0, min(j0 + _xor_tile, u.shape[1]))
+
+
+@jit(parallel=True)
+def _xor_timeseries_parallel(u, n_slabs):
+    # Each column is independent in time, so every thread gets a contiguous slab of columns and
+    # runs the full temporal loop over it, tile by tile
+    for s in numba.prange(n_slabs):
+        j0 = (s * u.shape[1]) // n_slabs
+        j1 = ((s + 1) * u.shape[1]) // n_slabs
+        for k0 in range(j0, j1, _xor_tile):
+            _xor_tile_backward(u, k0, min(k0 + _xor_tile, j1))
+
+
+@jit(parallel=True)
+def _xor_timeseries_reverse_parallel(u, n_slabs):
+    for s in numba.prange(n_slabs):
+        j0 = (s * u.shape[1]) // n_slabs
+        j1 = ((s + 1) * u.shape[1]) // n_slabs
+        for k0 in range(j0, j1, _xor_tile):
+            _xor_tile_forward(u, k0, min(k0 + _xor_tile, j1))
+
+
+_xor_parallel_threshold = 1 << 15  # Below this many words, threads cost more than they save
+_xor_cache_line = 64  # Bytes
+
+
+def _xor_slab_count(u):
+    """Return the number of column slabs to split `u` into across threads, or 1 to run serially
+
+    Each slab gets at least one cache line of every row, so that narrow rows are not split between
+    threads writing to the same lines.
+
+    """
+    if u.size < _xor_parallel_threshold:
+        return 1
+    return max(1, min(numba.get_num_threads(), (u.shape[1] * u.itemsize) // _xor_cache_line))
+
+
 def xor_timeseries(c):
     """XOR a time-series of data in place
 
     Assumes time varies along the first dimension of the input array, but any number of other
-    dimensions are supported.
+    dimensions are supported.  A 1-d input is viewed as 64-bit words exactly as `c.view(np.uint64)`
+    would; in particular, a 1-d array of complex numbers or of 4-byte items is treated as a flat
+    sequence of 64-bit words.  Higher-dimensional inputs may have rows of any width; each row is
+    XORed as a whole.  Inputs that are not C-contiguous, such as `a[:, 1:]`, must have 8-byte items,
+    and are processed more slowly.
 
     This function leaves the first time step unchanged, but successive timesteps are the XOR from
     the preceding time step — storing only the bits that have changed.  This transformation is
@@ -209,14 +569,23 @@ def xor_timeseries(c):
     The function `xor_timeseries_reverse` achieves the opposite transformation, recovering the
     original data with bit-for-bit accuracy.
 
+    Large arrays with rows of at least two cache lines are split across threads by column; the
+    number of threads can be controlled with `numba.set_num_threads`.  See `xor_timeseries_out` for a
+    version that leaves `c` unchanged.
+
     """
-    u = c.view(np.uint64)
-    for i in range(u.shape[0] - 1, 0, -1):
-        u[i] = np.bitwise_xor(u[i - 1], u[i])
+    if not c.flags["C_CONTIGUOUS"]:
+        _xor_timeseries_strided(c.view(_xor_word_dtype(c)))
+        return c
+    u = _xor_rows(c)
+    n_slabs = _xor_slab_count(u)
+    if n_slabs == 1:
+        _xor_timeseries(u)
+    else:
+        _xor_timeseries_parallel(u, n_slabs)
     return c
 
 
-@jit
 def xor_timeseries_reverse(c):
     """XOR a time-series of data in place
 
@@ -224,12 +593,87 @@ def xor_timeseries_reverse(c):
     details.
 
     """
-    u = c.view(np.uint64)
-    for i in range(1, u.shape[0]):
-        u[i] = np.bitwise_xor(u[i - 1], u[i])
+    if not c.flags["C_CONTIGUOUS"]:
+        _xor_timeseries_reverse_strided(c.view(_xor_word_dtype(c)))
+        return c
+    u = _xor_rows(c)
+    n_slabs = _xor_slab_count(u)
+    if n_slabs == 1:
+        _xor_timeseries_reverse(u)
+    else:
+        _xor_timeseries_reverse_parallel(u, n_slabs)
     return c
 
 
+def xor_timeseries_out(c, out=None, xp=np):
+    """XOR a time-series of data, writing the result to a separate array
+
+    This produces the same result as `xor_timeseries`, but without modifying `c`.  Because each
+    output time step depends only on two input time steps, this is a purely elementwise operation,
+    which can also run on a GPU by passing an array module like `cupy` as `xp`, along with arrays
+    from that module.
+
+    Parameters
+    ==========
+    c: array
+        Input data, with time along the first dimension, interpreted as in `xor_timeseries`.
+    out: array, optional
+        Array of the same shape and dtype as `c` in which to store the result.  If not given, a new
+        array is allocated.
+    xp: module [defaults to numpy]
+        Array module to which `c` and `out` belong.
+
+    """
+    if out is None:
+        out = xp.empty_like(c)
+    if c.ndim == 0 or c.size == 0:
+        out[...] = c
+        return out
+    word = _xor_word_dtype(c)
+    u = c.view(word)
+    o = out.view(word)
+    o[0] = u[0]
+    xp.bitwise_xor(u[1:], u[:-1], out=o[1:])
+    return out
+
+
+def xor_timeseries_reverse_out(c, out=None, xp=np):
+    """Reverse `xor_timeseries`, writing the result to a separate array
+
+    This produces the same result as `xor_timeseries_reverse`, but without modifying `c`, by
+    accumulating the XOR along the time axis.  The parameters are the same as for
+    `xor_timeseries_out`, except that `xp` must support `xp.bitwise_xor.accumulate`.
+
+    """
+    if out is None:
+        out = xp.empty_like(c)
+    if c.ndim == 0 or c.size == 0:
+        out[...] = c
+        return out
+    word = _xor_word_dtype(c)
+    xp.bitwise_xor.accumulate(c.view(word), axis=0, out=out.view(word))
+    return out
+
+
+# Shifts that extract the four uint16s of a uint64 word, in memory order
+_fletcher_word_shifts = tuple(np.uint64(s) for s in ((0, 16, 32, 48) if sys.byteorder == "little" else (48, 32, 16, 0)))
+
+
+@jit(inline="always")
+def _fold65535(x):
+    """Reduce a uint64 modulo 65535, up to a representative in [0, 65535]
+
+    Because 2**16 (and hence 2**32) is 1 modulo 65535, adding the high part to the low part
+    preserves the residue; one 32-bit fold followed by three 16-bit folds brings any 64-bit value
+    into range without a division.
+
+    """
+    x = (x & np.uint64(0xFFFFFFFF)) + (x >> np.uint64(32))
+    x = (x & np.uint64(0xFFFF)) + (x >> np.uint64(16))
+    x = (x & np.uint64(0xFFFF)) + (x >> np.uint64(16))
+    return (x & np.uint64(0xFFFF)) + (x >> np.uint64(16))
+
+
 @jit
 def fletcher32(data):
     """Compute the Fletcher-32 checksum of an array
@@ -237,8 +681,9 @@ def fletcher32(data):
     This checksum is very easy to implement from scratch and very fast.
 
     Note that it's not entirely clear that everyone agrees on the naming of
-    these functions.  This version uses 16-bit input, 32-bit accumulators,
-    block sizes of 360, and a modulus of 65_535.
+    these functions.  This version uses 16-bit input, 64-bit accumulators,
+    and a modulus of 65_535; the result is identical to the classic version
+    with 32-bit accumulators and block sizes of 360.
 
     Parameters
     ==========
@@ -252,19 +697,56 @@ def fletcher32(data):
     """
     data = data.reshape((data.size,)).view(np.uint16)
     size = data.size
-    c0 = np.uint32(0)
-    c1 = np.uint32(0)
+    # Load four uint16s at a time as one uint64 and split it in registers
+    n_words = size // 4
+    words = data[: 4 * n_words].view(np.uint64)
+    s_a, s_b, s_c, s_d = _fletcher_word_shifts
+    mask = np.uint64(0xFFFF)
+    c0 = np.uint64(0)
+    c1 = np.uint64(0)
     j = 0
-    block_size = 360  # largest number of sums that can be performed without overflow
-    while j < size:
-        block_length = min(block_size, size - j)
-        for i in range(block_length):
-            c0 += data[j]
-            c1 += c0
-            j += 1
-        c0 %= np.uint32(65535)
-        c1 %= np.uint32(65535)
-    return c1 << np.uint32(16) | c0
+    # Largest n with 65535 * (1 + n + n*(n+1)/2) < 2**64, so the 64-bit accumulators only need to
+    # be reduced once per this many elements (rounded down to whole words)
+    block_size = 23_726_745 // 4
+    chunk_size = 360 // 4  # largest number of uint32 sums that can be performed without overflow
+    while j < n_words:
+        block_end = min(j + block_size, n_words)
+        while j < block_end:
+            chunk_length = min(chunk_size, block_end - j)
+            # Unrolling the recurrence `c0 += d[i]; c1 += c0` over the chunk of n = 4 * chunk_length
+            # elements gives
+            #   c1 += n * c0 + sum((n - i) * d[i]),  c0 += sum(d[i]),
+            # two independent reductions that the compiler can vectorize.  The reductions stay in
+            # 32 bits so that each vector holds twice as many lanes; 64-bit lanes measured slower,
+            # as did unrolling into explicit lanes by hand.
+            chunk = words[j : j + chunk_length]  # Slicing first lets the loop index skip wraparound checks
+            s0 = np.uint32(0)
+            s1 = np.uint32(0)
+            for i in range(chunk_length):
+                w = chunk[i]
+                a = np.uint32((w >> s_a) & mask)
+                b = np.uint32((w >> s_b) & mask)
+                c = np.uint32((w >> s_c) & mask)
+                d = np.uint32((w >> s_d) & mask)
+                s = a + b + c + d
+                s0 += s
+                # The four elements have weights 4k, 4k-1, 4k-2, 4k-3 with k = chunk_length - i;
+                # the subtraction may wrap, but the sum is taken modulo 2**32 and cannot overflow
+                s1 += np.uint32(4 * (chunk_length - i)) * s - b - np.uint32(2) * c - np.uint32(3) * d
+            c1 += np.uint64(4 * chunk_length) * c0 + np.uint64(s1)
+            c0 += np.uint64(s0)
+            j += chunk_length
+        c0 = _fold65535(c0)
+        c1 = _fold65535(c1)
+    for k in range(4 * n_words, size):  # At most three elements are left over
+        c0 += np.uint64(data[k])
+        c1 += c0
+    c0 = _fold65535(c0)
+    c1 = _fold65535(c1)
+    # The folds leave values in [0, 65535], with 65535 standing for 0; reduce fully at the end
+    c0 = c0 if c0 != np.uint64(65535) else np.uint64(0)
+    c1 = c1 if c1 != np.uint64(65535) else np.uint64(0)
+    return np.uint32(c1 << np.uint64(16) | c0)
 
 
 @functools.lru_cache()
@@ -89,3 +89,15 @@ def test_file_io(tempdir):
             if mode.startswith("Y"):
                 assert list(f1[mode].attrs.items()) == list(f2[mode].attrs.items())
                 assert np.array_equal(f1[mode][:], f2[mode][:])
+
+
+def test_corotating_paired_xor_inertial_round_trip(tmp_path):
+    """Saving an inertial-frame waveform XORs a strided slice of the log frame"""
+    from scri.SpEC.file_io import corotating_paired_xor
+
+    w = scri.sample_waveforms.fake_precessing_waveform(t_0=-400.0, t_1=100.0, dt=0.5, ell_max=4)
+    assert w.frameType == scri.Inertial
+    corotating_paired_xor.save(w, file_name=tmp_path / "waveform")
+    w2 = corotating_paired_xor.load(tmp_path / "waveform")
+    assert np.array_equal(w2.t, w.t)
+    assert np.max(np.abs(w2.to_inertial_frame().data - w.data)) < 1e-9 * np.max(np.abs(w.data))
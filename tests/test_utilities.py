@@ -51,3 +51,175 @@ def test_multishuffle_like_hdf5(bit_width):
 
     # Check that they are equal
     assert np.array_equal(scri_shuffle_data, hdf5_raw_data)
+
+
+@pytest.mark.parametrize("shape", [(1_000,), (1, 3), (1_000, 3), (1_000, 7, 2), (2_000, 50), (20, 2_500)])
+def test_xor_timeseries(shape):
+    np.random.seed(12345)
+    data = np.random.normal(size=shape) + 1j * np.random.normal(size=shape)
+    u = data.view(np.uint64)  # For 1-d input, this is a flat sequence of words (real, imag, real, ...)
+    expected = u.copy()
+    expected[1:] = np.bitwise_xor(u[1:], u[:-1])
+    xored_out = scri.utilities.xor_timeseries_out(data)
+    assert np.array_equal(xored_out.view(np.uint64), expected)
+    unxored_out = np.empty_like(data)
+    assert scri.utilities.xor_timeseries_reverse_out(xored_out, out=unxored_out) is unxored_out
+    assert np.array_equal(unxored_out.view(np.uint64), u)
+    xored = scri.utilities.xor_timeseries(data.copy())
+    assert np.array_equal(xored.view(np.uint64), expected)
+    assert np.array_equal(scri.utilities.xor_timeseries_reverse(xored).view(np.uint64), u)
+
+
+def test_xor_timeseries_edge_cases():
+    for empty in [np.empty((0,)), np.empty((0, 4), dtype=complex), np.array(1.5)]:
+        assert np.array_equal(scri.utilities.xor_timeseries(empty.copy()), empty)
+        assert np.array_equal(scri.utilities.xor_timeseries_reverse(empty.copy()), empty)
+        assert np.array_equal(scri.utilities.xor_timeseries_out(empty), empty)
+        assert np.array_equal(scri.utilities.xor_timeseries_reverse_out(empty), empty)
+    ints = np.arange(10, dtype=np.int32)
+    expected = ints.view(np.uint64).copy()
+    expected[1:] ^= ints.view(np.uint64)[:-1]
+    assert np.array_equal(scri.utilities.xor_timeseries(ints.copy()).view(np.uint64), expected)
+    # Arrays that are not C-contiguous, like `a[:, 1:]`, are still accepted if their items are 64 bits wide
+    for a in [np.random.normal(size=(1_000, 4)), np.random.normal(size=(1_000, 4)) + 1j]:
+        original = a.copy()
+        strided = a.view(np.float64)[:, 1:]
+        expected = strided.view(np.uint64).copy()
+        expected[1:] ^= strided.view(np.uint64)[:-1]
+        assert np.array_equal(scri.utilities.xor_timeseries_out(strided).view(np.uint64), expected)
+        xored = scri.utilities.xor_timeseries(strided)
+        assert xored is strided and np.array_equal(xored.view(np.uint64), expected)
+        scri.utilities.xor_timeseries_reverse(strided)
+        assert np.array_equal(a.view(np.uint64), original.view(np.uint64))
+    with pytest.raises(ValueError, match="C-contiguous"):
+        scri.utilities.xor_timeseries(np.random.normal(size=(10, 4)).astype(np.float32).T)
+    with pytest.raises(ValueError, match="64-bit words"):
+        scri.utilities.xor_timeseries(np.zeros(9, dtype=np.float32))
+    # Rows that are not a whole number of 64-bit words are XORed with narrower words
+    for dtype, width in [(np.float32, 3), (np.int16, 5), (np.uint8, 7)]:
+        data = np.random.randint(0, 100, size=(1_000, width)).astype(dtype)
+        expected = data.copy()
+        expected.view(np.uint8)[1:] ^= data.view(np.uint8)[:-1]
+        assert np.array_equal(scri.utilities.xor_timeseries(data.copy()).view(np.uint8), expected.view(np.uint8))
+        assert np.array_equal(scri.utilities.xor_timeseries_out(data).view(np.uint8), expected.view(np.uint8))
+        assert np.array_equal(scri.utilities.xor_timeseries_reverse(expected.copy()), data)
+        assert np.array_equal(scri.utilities.xor_timeseries_reverse_out(expected), data)
+
+
+def test_xor_timeseries_parallel(monkeypatch):
+    from scri import utilities
+
+    monkeypatch.setattr(utilities.numba, "get_num_threads", lambda: 4)
+    assert utilities._xor_slab_count(np.empty((10, 77), dtype=np.uint64)) == 1  # Too small to be worth threads
+    assert utilities._xor_slab_count(np.empty((50_000, 6), dtype=np.uint64)) == 1  # Rows under two cache lines
+    assert utilities._xor_slab_count(np.empty((2_000, 20), dtype=np.uint64)) == 2
+    assert utilities._xor_slab_count(np.empty((2_000, 20), dtype=np.uint32)) == 1
+    assert utilities._xor_slab_count(np.empty((1_000, 77), dtype=np.uint64)) == 4
+    monkeypatch.setattr(utilities.numba, "get_num_threads", lambda: 1)
+    assert utilities._xor_slab_count(np.empty((1_000, 77), dtype=np.uint64)) == 1
+    np.random.seed(1234)
+    u = np.random.randint(0, 2**63, size=(100, 5_000), dtype=np.uint64)
+    expected = u.copy()
+    utilities._xor_timeseries(expected)
+    xored = u.copy()
+    utilities._xor_timeseries_parallel(xored, 3)
+    assert np.array_equal(xored, expected)
+    utilities._xor_timeseries_reverse_parallel(xored, 3)
+    assert np.array_equal(xored, u)
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 359, 360, 361, 362, 10_001])
+def test_fletcher32(size):
+    np.random.seed(1234)
+    for data in [np.random.randint(0, 2**16, size=size, dtype=np.uint16), np.full(size, 2**16 - 1, dtype=np.uint16)]:
+        d = data.astype(object)
+        expected = (int(np.sum(np.cumsum(d))) % 65535) << 16 | int(np.sum(d)) % 65535
+        checksum = scri.utilities.fletcher32(data)
+        assert checksum == expected
+
+
+def test_fletcher32_long_input():
+    # Long enough that the 64-bit accumulators have to be reduced partway through
+    n = 23_726_745 + 1_000
+    data = np.full(n, 2**16 - 2, dtype=np.uint16)  # -1 modulo 65535
+    expected = (-(n * (n + 1) // 2) % 65535) << 16 | (-n % 65535)
+    assert scri.utilities.fletcher32(data) == expected
+
+
+@pytest.mark.parametrize("kind", ["smooth", "hard", "rational"])
+def test_transition_and_bump_functions(kind):
+    from scri.utilities import transition_function, transition_function_derivative, bump_function
+
+    x = np.linspace(-1.0, 2.0, 30_001)
+    t, i0, i1 = transition_function(x, 0.25, 1.25, y0=-1.0, y1=2.0, return_indices=True, kind=kind)
+    assert np.all(x[:i0] <= 0.25) and np.all(x[i1:] >= 1.25) and np.all(x[i0:i1] > 0.25) and np.all(x[i0:i1] < 1.25)
+    assert np.all(t[:i0] == -1.0) and np.all(t[i1:] == 2.0) and np.all(np.diff(t) >= 0)
+    assert np.isclose(t[np.argmin(np.abs(x - 0.75))], 0.5)
+    t_dot = transition_function_derivative(x, 0.25, 1.25, y0=-1.0, y1=2.0, kind=kind)
+    assert np.all(t_dot[:i0] == 0.0) and np.all(t_dot[i1:] == 0.0)
+    assert np.allclose(t_dot[i0 + 1 : i1 - 1], np.gradient(t, x)[i0 + 1 : i1 - 1], atol=1e-6)
+    b = bump_function(x, 0.0, 0.5, 1.0, 1.5, y0=1.0, y12=3.0, y3=-2.0, kind=kind)
+    assert np.all(b[x <= 0.0] == 1.0) and np.all(b[(x >= 0.5) & (x <= 1.0)] == 3.0) and np.all(b[x >= 1.5] == -2.0)
+    assert np.allclose(b[x < 0.75], transition_function(x, 0.0, 0.5, 1.0, 3.0, kind=kind)[x < 0.75])
+    assert np.allclose(b[x > 0.75], transition_function(x, 1.0, 1.5, 3.0, -2.0, kind=kind)[x > 0.75])
+    with pytest.raises(ValueError):
+        transition_function(x, 0.25, 1.25, kind="sharp")
+    # Transition regions extending past either end of `x`
+    t, i0, i1 = transition_function(x, -2.0, 1.0, return_indices=True, kind=kind)
+    assert i0 == 0 and np.all(t[i1:] == 1.0) and 0 < t[0] < 1
+    t, i0, i1 = transition_function(x, 1.0, 3.0, return_indices=True, kind=kind)
+    assert i1 == x.size and np.all(t[:i0] == 0.0) and 0 < t[-1] < 1
+    assert np.all(transition_function(x, 5.0, 6.0, kind=kind) == 0.0)
+    # Here, (x-x0)/(x1-x0) rounds to exactly 1 at the last point inside (x0, x1)
+    x = np.linspace(0, 1.2, 777)
+    t = transition_function(x, 0.2, 0.9, kind=kind)
+    assert np.all(np.isfinite(t)) and np.all(np.diff(t) >= 0) and t[np.searchsorted(x, 0.9) - 1] <= 1.0
+    assert np.all(np.isfinite(transition_function_derivative(x, 0.2, 0.9, kind=kind)))
+
+
+def test_transition_parallel_kernels():
+    from scri import utilities
+
+    x = np.linspace(0.25, 1.25, 50_001)[1:-1]
+    for serial, parallel in [
+        (utilities._transition_interior_serial, utilities._transition_interior_parallel),
+        (utilities._transition_derivative_interior_serial, utilities._transition_derivative_interior_parallel),
+    ]:
+        assert np.array_equal(serial(x, 0.25, 1.25, -1.0, 2.0), parallel(x, 0.25, 1.25, -1.0, 2.0))
+
+
+def test_transition_interior_accuracy():
+    from scri import utilities
+
+    # Compare against `np.exp` with the same tau, so that any difference comes from the inlined
+    # exponential, compiled with the kernels' own fastmath flags
+    x0, x1 = 0.25, 1.25
+    x = np.linspace(x0, x1, 200_001)[1:-1]
+    tau = (x - x0) * (1.0 / (x1 - x0))
+    with np.errstate(over="ignore"):
+        expected = 1.0 / (1.0 + np.exp(1.0 / tau - 1.0 / (1.0 - tau)))
+    normal = expected > 1e-300
+    for kernel in [utilities._transition_interior_serial, utilities._transition_interior_parallel]:
+        transition = kernel(x, x0, x1, 0.0, 1.0)
+        assert np.max(np.abs(transition[normal] / expected[normal] - 1)) < 2e-15
+        assert np.all(transition[~normal] <= 1e-300)
+
+
+def test_transition_to_constant():
+    from scri.utilities import transition_to_constant, transition_function
+
+    t = np.linspace(0.0, 10.0, 20_001)
+    f = np.sin(t) + 1j * t ** 2
+    g = transition_to_constant(f, t, 3.0, 6.0)
+    _, i1, i2 = transition_function(t, 3.0, 6.0, return_indices=True)
+    assert np.array_equal(g[:i1], f[:i1])
+    assert np.all(g[i2:] == g[i2 - 1])
+    # The derivative of the result is the derivative of `f` times the transition function
+    expected = (np.cos(t) + 2j * t) * transition_function(t, 3.0, 6.0, y0=1.0, y1=0.0)
+    assert np.allclose(np.gradient(g, t)[1:-1], expected[1:-1], atol=1e-6)
+    # Extra axes are transitioned independently, with the same result as one column at a time
+    F = np.stack([f, 2.0 * f[::-1], np.cos(3 * t) + 0j], axis=-1).reshape(t.size, 3, 1)
+    G = transition_to_constant(F, t, 3.0, 6.0)
+    assert G.shape == F.shape
+    for k in range(3):
+        assert np.allclose(G[:, k, 0], transition_to_constant(F[:, k, 0], t, 3.0, 6.0), rtol=1e-14, atol=1e-14)